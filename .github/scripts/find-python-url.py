@@ -1,57 +1,59 @@
 #!/usr/bin/env python3
 import json
 import os
-import re
-import subprocess
 import sys
 import time
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
 
 API_URL = "https://api.github.com/repos/astral-sh/python-build-standalone/releases/latest"
 TOKEN = os.environ.get("GITHUB_TOKEN")
+BACKOFF = (0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0)
 
 
 def fetch_releases(max_attempts: int = 8) -> str:
+    headers = {"User-Agent": "whatsapp-release-scripts"}
+    if TOKEN:
+        headers["Authorization"] = f"Bearer {TOKEN}"
+    request = Request(API_URL, headers=headers)
+
     attempt = 0
     while attempt < max_attempts:
         attempt += 1
-        cmd = [
-            "curl",
-            "-fsSL",
-            "-L",
-            "-w",
-            "%{http_code}",
-            "--connect-timeout",
-            "10",
-            "--max-time",
-            "60",
-        ]
-        if TOKEN:
-            cmd += ["-H", f"Authorization: Bearer {TOKEN}"]
-        cmd.append(API_URL)
-
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        stdout = proc.stdout[:-3] if len(proc.stdout) >= 3 else ""
-        status = proc.stdout[-3:]
-
-        if proc.returncode == 0 and status == "200":
-            return stdout
-
-        if status.isdigit() and status.startswith("5") and attempt < max_attempts:
-            sleep_for = min(5 * attempt, 30)
+        try:
+            with urlopen(request, timeout=60) as response:
+                return response.read().decode("utf-8")
+        except HTTPError as exc:
+            status = exc.code
+        except (URLError, TimeoutError, OSError) as exc:
+            sys.stderr.write(f"Request failed: {exc}\n")
+            sys.exit(1)
+
+        if 500 <= status < 600 and attempt < max_attempts:
+            sleep_for = BACKOFF[min(attempt - 1, len(BACKOFF) - 1)]
             sys.stderr.write(
-                f"curl returned {status}. Retrying in {sleep_for}s (attempt {attempt}/{max_attempts})\n"
+                f"GitHub returned {status}. Retrying in {sleep_for}s (attempt {attempt}/{max_attempts})\n"
             )
             sys.stderr.flush()
             time.sleep(sleep_for)
             continue
 
-        sys.stderr.write(proc.stderr or f"curl failed with status {status}\n")
-        sys.exit(proc.returncode or 1)
+        sys.stderr.write(f"Request failed with status {status}\n")
+        sys.exit(1)
 
     sys.stderr.write("Exceeded retry attempts fetching latest release\n")
     sys.exit(1)
 
 
+def is_candidate(name: str) -> bool:
+    return (
+        name.startswith("cpython-3.11.")
+        and "x86_64-unknown-linux-gnu" in name
+        and "install_only" in name
+        and name.endswith((".tar.gz", ".tar.zst"))
+    )
+
+
 result = fetch_releases()
 
 try:
@@ -63,10 +65,6 @@ except json.JSONDecodeError as exc:
 print(f"Release tag: {release.get('tag_name', 'Unknown')}", file=sys.stderr)
 print(f"Number of assets: {len(release.get('assets', []))}", file=sys.stderr)
 
-pattern = re.compile(
-    r"^cpython-3\.11\.\d+\+\d{8}-x86_64-unknown-linux-gnu-.*install_only.*\.(tar\.gz|tar\.zst)$"
-)
-
 fallback_url = None
 
 for asset in release.get("assets", []):
@@ -76,7 +74,7 @@ for asset in release.get("assets", []):
     if "cpython-3.11" in name and "x86_64-unknown-linux-gnu" in name:
         print(f"Found relevant asset: {name}", file=sys.stderr)
 
-    if pattern.match(name):
+    if is_candidate(name):
         if name.endswith(".tar.zst"):
             print(url)
             sys.exit(0)
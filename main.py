@@ -10,13 +10,16 @@ import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from urllib.error import HTTPError, URLError
 from urllib.parse import quote
-from urllib.request import Request, urlopen
 
 from _version import __version__
 from rgw_cli_contract import AppSpec, resolve_install_script_path, run_app
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 INSTALL_SCRIPT = resolve_install_script_path(__file__)
 DEFAULT_MANAGED_PROFILE_DIR = "~/.whatsapp-web"
 DEFAULT_CDP_ENDPOINTS = (
@@ -54,11 +57,32 @@ features:
   save a contact label
   # whatsapp ac <label> <number>
   whatsapp ac mom 919999999999
+
+  send every {phone, text} entry of a JSON file in one browser session
+  # whatsapp -b <messages.json>
+  whatsapp -b messages.json
+
+  keep one warm browser connection alive for fast repeat sends
+  # whatsapp daemon
+  whatsapp daemon
+
+  hand the message to the system WhatsApp handler via a wa.me link
+  # whatsapp -n <phone|label> <message...>
+  whatsapp -n mom "reached home"
 """
 
 
+# Deletes every Latin-1 non-digit in one C-level pass; anything outside that
+# range is rare in phone input and handled by the fallback below.
+_NON_DIGITS = str.maketrans(
+    "", "", "".join(chr(code) for code in range(256) if not chr(code).isdigit())
+)
+
+
 def normalize_phone(raw):
-    digits = "".join(ch for ch in raw if ch.isdigit())
+    digits = raw.translate(_NON_DIGITS)
+    if not digits.isdigit():
+        digits = "".join(ch for ch in digits if ch.isdigit())
     if not digits:
         raise SystemExit("Phone number must include digits and country code.")
     return digits
@@ -95,18 +119,13 @@ def _playwright_env():
 
 
 def get_config_path():
-    base = os.getenv("XDG_CONFIG_HOME")
-    if not base:
-        base = os.path.expanduser("~/.config")
-    base = os.path.expanduser(base)
+    base = os.getenv("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
     return os.path.join(base, "whatsapp", "config.json")
 
 
 def get_state_dir():
-    base = os.getenv("XDG_STATE_HOME")
-    if not base:
-        base = os.path.expanduser("~/.local/state")
-    return Path(os.path.expanduser(base)) / "whatsapp"
+    base = os.getenv("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    return Path(base) / "whatsapp"
 
 
 def get_worker_log_path():
@@ -125,13 +144,27 @@ def get_job_path(job_id):
     return get_jobs_dir() / f"{job_id}.json"
 
 
+def _json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_pretty(payload):
+    if orjson is not None:
+        return orjson.dumps(
+            payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        ).decode("utf-8")
+    return json.dumps(payload, indent=2, sort_keys=True)
+
+
 def load_config(config_path):
     if not os.path.exists(config_path):
         return {}
     try:
         with open(config_path, "r", encoding="utf-8") as handle:
-            payload = json.load(handle)
-    except (OSError, json.JSONDecodeError) as exc:
+            payload = _json_loads(handle.read())
+    except (OSError, ValueError) as exc:
         raise SystemExit(f"Unable to read config at {config_path}: {exc}")
 
     if payload is None:
@@ -145,7 +178,7 @@ def save_config(config_path, payload):
     directory = os.path.dirname(config_path)
     os.makedirs(directory, exist_ok=True)
     with open(config_path, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write(_json_dumps_pretty(payload))
         handle.write("\n")
 
 
@@ -181,20 +214,54 @@ def _candidate_cdp_endpoints(config):
 
 
 def _probe_cdp_endpoint(endpoint):
+    from urllib.error import HTTPError, URLError
+    from urllib.request import Request, urlopen
+
     base = endpoint.rstrip("/")
     request = Request(f"{base}/json/version", headers={"User-Agent": "Mozilla/5.0"})
     try:
         with urlopen(request, timeout=1.5) as response:
-            payload = json.load(response)
-    except (OSError, TimeoutError, URLError, HTTPError, ValueError, json.JSONDecodeError):
+            payload = _json_loads(response.read())
+    except (OSError, TimeoutError, URLError, HTTPError, ValueError):
         return False
     return isinstance(payload, dict) and bool(payload.get("webSocketDebuggerUrl"))
 
 
+def get_cdp_endpoint_cache_path():
+    return get_state_dir() / "cdp-endpoint"
+
+
+def _read_cached_cdp_endpoint():
+    try:
+        value = get_cdp_endpoint_cache_path().read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return value or None
+
+
+def _write_cached_cdp_endpoint(endpoint):
+    path = get_cdp_endpoint_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.tmp")
+        temp_path.write_text(f"{endpoint}\n", encoding="utf-8")
+        temp_path.replace(path)
+    except OSError:
+        pass
+
+
 def find_cdp_endpoint(config):
     endpoints, explicit = _candidate_cdp_endpoints(config)
+    if not explicit:
+        cached = _read_cached_cdp_endpoint()
+        if cached:
+            if cached in endpoints:
+                endpoints.remove(cached)
+            endpoints.insert(0, cached)
     for endpoint in endpoints:
         if _probe_cdp_endpoint(endpoint):
+            if not explicit:
+                _write_cached_cdp_endpoint(endpoint)
             return endpoint
     if explicit:
         raise SystemExit(
@@ -443,6 +510,21 @@ def open_existing_browser(url, config):
     return True
 
 
+def open_native_handler(url):
+    path = shutil.which("xdg-open")
+    if not path:
+        raise SystemExit("xdg-open was not found. Install xdg-utils or drop -n.")
+    try:
+        subprocess.Popen(
+            [path, url],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as exc:
+        raise SystemExit(f"Unable to launch xdg-open: {exc}") from exc
+
+
 def build_parser():
     parser = argparse.ArgumentParser(
         description="Send a WhatsApp message via WhatsApp Web.",
@@ -471,6 +553,18 @@ def build_parser():
         action="store_true",
         help=argparse.SUPPRESS,
     )
+    parser.add_argument(
+        "-n",
+        dest="native",
+        action="store_true",
+        help="Open the wa.me deep link with the system handler instead of a browser.",
+    )
+    parser.add_argument(
+        "-b",
+        dest="batch",
+        metavar="PATH",
+        help="Send every {phone, text} entry in a JSON batch file.",
+    )
     parser.add_argument(
         "-jid",
         dest="job_id",
@@ -479,41 +573,49 @@ def build_parser():
     return parser
 
 
-def wait_for_ready(page, timeout_s):
-    deadline = time.time() + timeout_s
-    informed = False
-    last_status = time.time()
-    while True:
-        if time.time() >= deadline:
-            raise SystemExit("Timed out waiting for WhatsApp Web.")
-
-        if page.locator("span[data-icon='send']").first.is_visible(timeout=0):
-            return
-
-        if find_compose_box(page) is not None:
-            return
+READY_SELECTOR = ", ".join(
+    (
+        "span[data-icon='send']",
+        "div[data-testid='conversation-compose-box-input']",
+        "div[contenteditable='true'][data-tab='10']",
+        "div[contenteditable='true'][data-tab='6']",
+    )
+)
+QR_SELECTOR = "div[data-testid='qrcode'], canvas[aria-label*='Scan']"
+PENDING_SELECTOR = "span[data-icon='msg-time']"
 
 
-        qr_visible = False
-        for selector in ("div[data-testid='qrcode']", "canvas[aria-label*='Scan']"):
-            if page.locator(selector).first.is_visible(timeout=0):
-                qr_visible = True
-                break
+def wait_for_ready(page, timeout_s):
+    playwright_symbols = _playwright_symbols()
+    if playwright_symbols is None:
+        raise SystemExit("Missing dependency: playwright. Install requirements.txt first.")
+    _, PlaywrightTimeoutError = playwright_symbols
 
-        if qr_visible and not informed:
-            print(
-                "Waiting for WhatsApp Web to be ready. "
-                "If this is your first run, scan the QR code.",
-                file=sys.stderr,
-            )
-            informed = True
+    deadline = time.time() + timeout_s
+    try:
+        page.locator(f"{READY_SELECTOR}, {QR_SELECTOR}").first.wait_for(
+            state="visible", timeout=timeout_s * 1000
+        )
+    except PlaywrightTimeoutError as exc:
+        raise SystemExit("Timed out waiting for WhatsApp Web.") from exc
 
-        now = time.time()
-        if now - last_status >= 30:
-            print("Still waiting for WhatsApp Web...", file=sys.stderr)
-            last_status = now
+    if page.locator(READY_SELECTOR).first.is_visible(timeout=0):
+        return
 
-        time.sleep(0.8)
+    print(
+        "Waiting for WhatsApp Web to be ready. "
+        "If this is your first run, scan the QR code.",
+        file=sys.stderr,
+    )
+    remaining_s = deadline - time.time()
+    if remaining_s <= 0:
+        raise SystemExit("Timed out waiting for WhatsApp Web.")
+    try:
+        page.locator(READY_SELECTOR).first.wait_for(
+            state="visible", timeout=remaining_s * 1000
+        )
+    except PlaywrightTimeoutError as exc:
+        raise SystemExit("Timed out waiting for WhatsApp Web.") from exc
 
 
 def find_compose_box(page):
@@ -541,6 +643,19 @@ def send_message(page, text):
     page.click("span[data-icon='send']")
 
 
+def wait_for_send_confirmation(page, PlaywrightTimeoutError):
+    # Ticks on older messages match any tick selector as soon as history
+    # renders, so wait for the pending clock on our message to disappear.
+    try:
+        page.wait_for_function(
+            f"() => !document.querySelector(\"{PENDING_SELECTOR}\")",
+            timeout=3000,
+        )
+    except PlaywrightTimeoutError:
+        # WhatsApp may have sent the message without clearing the clock yet.
+        pass
+
+
 def is_whatsapp_web_url(url):
     value = (url or "").strip().lower()
     return value.startswith("https://web.whatsapp.com/")
@@ -567,12 +682,219 @@ def create_background_page(browser, context):
     return page_info.value
 
 
+def _send_on_context(browser, context, url, text, timeout_s, PlaywrightTimeoutError):
+    page = None
+    created_page = False
+    try:
+        try:
+            page = create_background_page(browser, context)
+            created_page = True
+        except Exception:
+            page = find_existing_whatsapp_page(context)
+            if page is None:
+                page = context.new_page()
+                created_page = True
+
+        try:
+            page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except PlaywrightTimeoutError as exc:
+            raise SystemExit("Navigation timed out. Try again.") from exc
+
+        wait_for_ready(page, timeout_s)
+        send_message(page, text)
+        wait_for_send_confirmation(page, PlaywrightTimeoutError)
+    finally:
+        if created_page and page is not None:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+
 def send_message_via_existing_chromium(url, text, timeout_s, cdp_endpoint):
     playwright_symbols = _playwright_symbols()
     if playwright_symbols is None:
         raise SystemExit("Missing dependency: playwright. Install requirements.txt first.")
     sync_playwright, PlaywrightTimeoutError = playwright_symbols
 
+    with _playwright_env():
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.connect_over_cdp(cdp_endpoint)
+            contexts = browser.contexts
+            if not contexts:
+                raise SystemExit(
+                    f"Connected to Chromium at {cdp_endpoint}, but no browser context was available."
+                )
+            _send_on_context(
+                browser, contexts[0], url, text, timeout_s, PlaywrightTimeoutError
+            )
+            print("Message sent.")
+
+
+def get_daemon_socket_path():
+    return Path(os.path.expanduser(DEFAULT_MANAGED_PROFILE_DIR)) / "ipc.sock"
+
+
+def send_via_daemon(phone, text, timeout_s):
+    """Send through a warm daemon. Returns False when none is reachable."""
+    import socket
+
+    socket_path = get_daemon_socket_path()
+    if not socket_path.exists():
+        return False
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.settimeout(timeout_s + 65)
+        connection.connect(str(socket_path))
+    except OSError:
+        connection.close()
+        return False
+
+    try:
+        with connection, connection.makefile("rw", encoding="utf-8") as stream:
+            stream.write(json.dumps({"phone": phone, "text": text}, sort_keys=True))
+            stream.write("\n")
+            stream.flush()
+            line = stream.readline()
+    except OSError:
+        return False
+
+    try:
+        reply = _json_loads(line) if line.strip() else None
+    except ValueError:
+        reply = None
+    if not isinstance(reply, dict):
+        return False
+    if reply.get("ok"):
+        return True
+    if reply.get("retry"):
+        # The daemon lost its browser; let the one-shot path handle this send.
+        return False
+    raise SystemExit(reply.get("error") or "WhatsApp daemon reported a send failure.")
+
+
+def _handle_daemon_request(browser, context, line, timeout_s, PlaywrightTimeoutError):
+    try:
+        payload = _json_loads(line)
+    except ValueError as exc:
+        return {"ok": False, "error": f"Invalid daemon request: {exc}"}
+    if not isinstance(payload, dict):
+        return {"ok": False, "error": "Daemon request must be a JSON object."}
+
+    phone = str(payload.get("phone") or "").strip()
+    text = str(payload.get("text") or "").strip()
+    if not phone or not text:
+        return {"ok": False, "error": "Daemon request needs phone and text."}
+
+    url = f"https://web.whatsapp.com/send?phone={phone}&text={quote(text)}"
+    try:
+        _send_on_context(browser, context, url, text, timeout_s, PlaywrightTimeoutError)
+    except SystemExit as exc:
+        return {"ok": False, "error": str(exc) or "WhatsApp send failed."}
+    except Exception as exc:
+        return {"ok": False, "error": str(exc) or exc.__class__.__name__}
+    return {"ok": True}
+
+
+def run_daemon(timeout_s=120):
+    import socket
+
+    playwright_symbols = _playwright_symbols()
+    if playwright_symbols is None:
+        raise SystemExit("Missing dependency: playwright. Install requirements.txt first.")
+    sync_playwright, PlaywrightTimeoutError = playwright_symbols
+
+    config = load_config(get_config_path())
+    cdp_endpoint = find_cdp_endpoint(config)
+    if not cdp_endpoint:
+        raise SystemExit(
+            "No Chromium CDP endpoint found. "
+            "Start Chromium with --remote-debugging-port=9222 first."
+        )
+
+    socket_path = get_daemon_socket_path()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.suppress(OSError):
+        socket_path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with _playwright_env():
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.connect_over_cdp(cdp_endpoint)
+            contexts = browser.contexts
+            if not contexts:
+                raise SystemExit(
+                    f"Connected to Chromium at {cdp_endpoint}, but no browser context was available."
+                )
+            context = contexts[0]
+            try:
+                server.bind(str(socket_path))
+                server.listen(1)
+                print(f"whatsapp daemon listening on {socket_path}", file=sys.stderr)
+                browser_lost_reply = {
+                    "ok": False,
+                    "error": "Chromium connection lost.",
+                    "retry": True,
+                }
+                while True:
+                    connection, _ = server.accept()
+                    with connection, connection.makefile(
+                        "rw", encoding="utf-8"
+                    ) as stream:
+                        line = stream.readline()
+                        if not line.strip():
+                            continue
+                        if not browser.is_connected():
+                            reply = browser_lost_reply
+                        else:
+                            reply = _handle_daemon_request(
+                                browser, context, line, timeout_s, PlaywrightTimeoutError
+                            )
+                            if not reply.get("ok") and not browser.is_connected():
+                                reply = browser_lost_reply
+                        stream.write(json.dumps(reply, sort_keys=True))
+                        stream.write("\n")
+                        stream.flush()
+                    if not browser.is_connected():
+                        print(
+                            "Chromium connection lost; daemon exiting.",
+                            file=sys.stderr,
+                        )
+                        break
+            finally:
+                server.close()
+                with contextlib.suppress(OSError):
+                    socket_path.unlink()
+
+
+def iter_batch_messages(handle, path):
+    try:
+        import ijson
+    except ImportError:
+        try:
+            payload = _json_loads(handle.read())
+        except ValueError as exc:
+            raise SystemExit(f"Unable to parse batch file {path}: {exc}") from exc
+        if not isinstance(payload, list):
+            raise SystemExit("Batch file must contain a JSON array.")
+        yield from payload
+        return
+
+    try:
+        yield from ijson.items(handle, "item")
+    except ijson.JSONError as exc:
+        raise SystemExit(f"Unable to parse batch file {path}: {exc}") from exc
+
+
+def send_batch_via_existing_chromium(messages, timeout_s, cdp_endpoint, contact_labels):
+    playwright_symbols = _playwright_symbols()
+    if playwright_symbols is None:
+        raise SystemExit("Missing dependency: playwright. Install requirements.txt first.")
+    sync_playwright, PlaywrightTimeoutError = playwright_symbols
+
+    sent = 0
+    failed = 0
     with _playwright_env():
         with sync_playwright() as playwright:
             browser = playwright.chromium.connect_over_cdp(cdp_endpoint)
@@ -594,15 +916,37 @@ def send_message_via_existing_chromium(url, text, timeout_s, cdp_endpoint):
                         page = context.new_page()
                         created_page = True
 
-                try:
-                    page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                except PlaywrightTimeoutError as exc:
-                    raise SystemExit("Navigation timed out. Try again.") from exc
-
-                wait_for_ready(page, timeout_s)
-                send_message(page, text)
-                time.sleep(1.5)
-                print("Message sent.")
+                for index, entry in enumerate(messages, start=1):
+                    if not isinstance(entry, dict):
+                        print(f"[{index}] skipped: entry must be an object", file=sys.stderr)
+                        failed += 1
+                        continue
+                    raw_target = str(entry.get("phone") or "").strip()
+                    text = " ".join(str(entry.get("text") or "").split())
+                    if not raw_target or not text:
+                        print(f"[{index}] skipped: entry needs phone and text", file=sys.stderr)
+                        failed += 1
+                        continue
+                    try:
+                        phone = normalize_phone(contact_labels.get(raw_target, raw_target))
+                    except SystemExit as exc:
+                        print(f"[{index}] skipped: {exc}", file=sys.stderr)
+                        failed += 1
+                        continue
+
+                    recipient = _recipient_label(raw_target, phone)
+                    url = f"https://web.whatsapp.com/send?phone={phone}&text={quote(text)}"
+                    try:
+                        page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                        wait_for_ready(page, timeout_s)
+                        send_message(page, text)
+                        wait_for_send_confirmation(page, PlaywrightTimeoutError)
+                    except (SystemExit, PlaywrightTimeoutError) as exc:
+                        print(f"[{index}] failed for {recipient}: {exc}", file=sys.stderr)
+                        failed += 1
+                        continue
+                    sent += 1
+                    print(f"[{index}] sent to {recipient}", flush=True)
             finally:
                 if created_page and page is not None:
                     try:
@@ -610,6 +954,29 @@ def send_message_via_existing_chromium(url, text, timeout_s, cdp_endpoint):
                     except Exception:
                         pass
 
+    print(f"Batch done: {sent} sent, {failed} failed.")
+    return 1 if failed else 0
+
+
+def send_batch(args, config, contact_labels):
+    # Open eagerly so a bad path fails before any browser work happens.
+    try:
+        handle = open(args.batch, "rb")
+    except OSError as exc:
+        raise SystemExit(f"Unable to read batch file {args.batch}: {exc}") from exc
+
+    with handle:
+        cdp_endpoint = find_cdp_endpoint(config)
+        if not cdp_endpoint:
+            raise SystemExit(
+                "Batch sends need a Chromium CDP endpoint. "
+                "Start Chromium with --remote-debugging-port=9222 first."
+            )
+        messages = iter_batch_messages(handle, args.batch)
+        return send_batch_via_existing_chromium(
+            messages, args.timeout, cdp_endpoint, contact_labels
+        )
+
 
 def execute_send(args, config, raw_target, phone, text, url):
     cdp_endpoint = find_cdp_endpoint(config)
@@ -638,7 +1005,9 @@ def execute_send(args, config, raw_target, phone, text, url):
         update_background_job(args.job_id, "running")
 
     try:
-        if cdp_endpoint:
+        if send_via_daemon(phone, text, args.timeout):
+            print("Message sent.")
+        elif cdp_endpoint:
             send_message_via_existing_chromium(url, text, args.timeout, cdp_endpoint)
         else:
             if not open_existing_browser(url, config):
@@ -690,6 +1059,11 @@ def _dispatch(argv: list[str]) -> int:
             raise SystemExit("Usage: whatsapp st [job_id]")
         return print_background_job_status(argv[1] if len(argv) == 2 else None)
 
+    if argv and argv[0] == "daemon":
+        if len(argv) != 1:
+            raise SystemExit("Usage: whatsapp daemon")
+        return run_daemon()
+
     if argv and argv[0] == "c":
         if len(argv) != 1:
             raise SystemExit("Usage: whatsapp c")
@@ -719,6 +1093,9 @@ def _dispatch(argv: list[str]) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.batch:
+        return send_batch(args, config, contact_labels)
+
     if not args.mobile_no:
         raise SystemExit("Usage: whatsapp <phone|label> <message...>")
 
@@ -731,6 +1108,15 @@ def _dispatch(argv: list[str]) -> int:
     target = contact_labels.get(raw_target, raw_target)
     phone = normalize_phone(target)
     message = quote(text)
+
+    if args.native:
+        open_native_handler(f"https://wa.me/{phone}?text={message}")
+        print(
+            "Handed the message to the system WhatsApp handler. "
+            "Press Enter there to send."
+        )
+        return 0
+
     url = f"https://web.whatsapp.com/send?phone={phone}&text={message}"
     return execute_send(args, config, raw_target, phone, text, url)
 
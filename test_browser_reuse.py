@@ -94,6 +94,159 @@ class BrowserReuseTests(unittest.TestCase):
         open_browser.assert_called_once()
         self.assertIn("Opened WhatsApp Web in Chromium", stdout.getvalue())
 
+    def test_native_flag_opens_wa_me_link_without_browser_automation(self):
+        with patch.object(sys, "argv", ["main.py", "-n", "mom", "hello world"]):
+            with patch.object(
+                main,
+                "load_config",
+                return_value={"contact_labels": {"mom": "919999999999"}},
+            ):
+                with patch.object(main.shutil, "which", return_value="/usr/bin/xdg-open"):
+                    with patch.object(main.subprocess, "Popen") as popen:
+                        with patch("sys.stdout", new=StringIO()) as stdout:
+                            rc = main.main()
+        self.assertEqual(rc, 0)
+        args = popen.call_args.args[0]
+        self.assertEqual(args[0], "/usr/bin/xdg-open")
+        self.assertEqual(args[1], "https://wa.me/919999999999?text=hello%20world")
+        self.assertIn("system WhatsApp handler", stdout.getvalue())
+
+    def test_batch_flag_streams_entries_into_one_session(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            batch_path = Path(tmp) / "messages.json"
+            batch_path.write_text(
+                json.dumps(
+                    [
+                        {"phone": "mom", "text": "hello"},
+                        {"phone": "919999999998", "text": "hi"},
+                    ]
+                ),
+                encoding="utf-8",
+            )
+            consumed = []
+
+            def fake_send(messages, timeout_s, cdp_endpoint, contact_labels):
+                consumed.extend(messages)
+                return 0
+
+            with patch.object(sys, "argv", ["main.py", "-b", str(batch_path)]):
+                with patch.object(
+                    main,
+                    "load_config",
+                    return_value={"contact_labels": {"mom": "919999999999"}},
+                ):
+                    with patch.object(
+                        main, "find_cdp_endpoint", return_value="http://127.0.0.1:9222"
+                    ):
+                        with patch.object(
+                            main,
+                            "send_batch_via_existing_chromium",
+                            side_effect=fake_send,
+                        ) as send:
+                            rc = main.main()
+        self.assertEqual(rc, 0)
+        send.assert_called_once()
+        self.assertEqual([entry["phone"] for entry in consumed], ["mom", "919999999998"])
+
+    def test_batch_with_missing_file_fails_before_browser_work(self):
+        with patch.object(sys, "argv", ["main.py", "-b", "/nonexistent/messages.json"]):
+            with patch.object(main, "load_config", return_value={}):
+                with patch.object(main, "find_cdp_endpoint") as find_endpoint:
+                    with self.assertRaises(SystemExit):
+                        main.main()
+        find_endpoint.assert_not_called()
+
+    def test_find_cdp_endpoint_probes_cached_endpoint_first(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(main.os.environ, {"XDG_STATE_HOME": tmp}, clear=False):
+                main._write_cached_cdp_endpoint("http://127.0.0.1:9333")
+                probed = []
+
+                def probe(endpoint):
+                    probed.append(endpoint)
+                    return endpoint == "http://127.0.0.1:9333"
+
+                with patch.object(main, "_probe_cdp_endpoint", side_effect=probe):
+                    endpoint = main.find_cdp_endpoint({})
+                self.assertEqual(endpoint, "http://127.0.0.1:9333")
+                self.assertEqual(probed, ["http://127.0.0.1:9333"])
+
+    def test_daemon_request_round_trip_reports_ok_and_errors(self):
+        with patch.object(main, "_send_on_context") as send:
+            reply = main._handle_daemon_request(
+                None,
+                None,
+                '{"phone": "919999999999", "text": "hello"}',
+                120,
+                Exception,
+            )
+        self.assertEqual(reply, {"ok": True})
+        url = send.call_args.args[2]
+        self.assertIn("phone=919999999999", url)
+
+        with patch.object(
+            main,
+            "_send_on_context",
+            side_effect=SystemExit("Timed out waiting for WhatsApp Web."),
+        ):
+            reply = main._handle_daemon_request(
+                None,
+                None,
+                '{"phone": "919999999999", "text": "hello"}',
+                120,
+                Exception,
+            )
+        self.assertEqual(
+            reply,
+            {"ok": False, "error": "Timed out waiting for WhatsApp Web."},
+        )
+
+        reply = main._handle_daemon_request(None, None, "not json", 120, Exception)
+        self.assertFalse(reply["ok"])
+
+    def test_send_via_daemon_returns_false_without_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.object(
+                main,
+                "get_daemon_socket_path",
+                return_value=Path(tmp) / "ipc.sock",
+            ):
+                self.assertFalse(main.send_via_daemon("919999999999", "hello", 120))
+
+    def test_send_via_daemon_falls_back_when_daemon_lost_its_browser(self):
+        import socket
+        import threading
+
+        def serve(server, reply):
+            connection, _ = server.accept()
+            with connection, connection.makefile("rw", encoding="utf-8") as stream:
+                stream.readline()
+                stream.write(reply)
+                stream.write("\n")
+                stream.flush()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = Path(tmp) / "ipc.sock"
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(str(socket_path))
+            server.listen(1)
+            thread = threading.Thread(
+                target=serve,
+                args=(
+                    server,
+                    '{"error": "Chromium connection lost.", "ok": false, "retry": true}',
+                ),
+            )
+            thread.start()
+            try:
+                with patch.object(
+                    main, "get_daemon_socket_path", return_value=socket_path
+                ):
+                    self.assertFalse(main.send_via_daemon("919999999999", "hello", 5))
+            finally:
+                thread.join(timeout=5)
+                server.close()
+
     def test_default_cdp_send_spawns_background_worker_and_records_job(self):
         with tempfile.TemporaryDirectory() as tmp:
             with patch.dict(main.os.environ, {"XDG_STATE_HOME": tmp}, clear=False):